@@ -1,7 +1,8 @@
-from flask import Flask, render_template, request, Response, redirect, url_for, flash
+from flask import Flask, render_template, request, Response, redirect, url_for, flash, jsonify
 from flask_mail import Mail, Message
 from collections import Counter
-from internshala_scraper import get_internships
+from internshala_scraper import get_internships, SIMULATED_SOURCES
+import job_archive
 import matplotlib.pyplot as plt
 import os
 import time
@@ -153,6 +154,7 @@ def get_jobs_cached():
                     job['scraped_at'] = datetime.now().isoformat()
             else:
                 logger.info(f"✅ Real-time data fetched: {len(jobs)} jobs from multiple sources")
+                archive_jobs(jobs)
             
             _cache.update({'jobs': jobs, 'ts': now})
             logger.info(f"Cache refreshed with {len(jobs)} jobs")
@@ -164,6 +166,16 @@ def get_jobs_cached():
                 return MOCK_JOBS.copy()
     return _cache['jobs'] or MOCK_JOBS.copy()
 
+def archive_jobs(jobs):
+    """Archive scraped jobs, leaving out simulated sources."""
+    scraped = [j for j in jobs if j.get('source') not in SIMULATED_SOURCES]
+    if not scraped:
+        return
+    try:
+        job_archive.archive_snapshot(scraped, tokenize_title)
+    except Exception as e:
+        logger.exception("Failed to archive jobs snapshot")
+
 # Stopwords to filter out
 STOPWORDS = {'the','a','an','and','or','to','for','with','in','on','of','by','at','from','is','are','as','be','this','that','you','we','they','it','its','have','has','had','will','would','could','should','may','might','can','must','shall','do','does','did','not','no','yes','but','if','then','else','when','where','why','how','what','which','who','whom','whose','there','here','up','down','out','off','over','under','again','further','then','once','more','most','other','some','such','only','own','same','so','than','too','very','just','now','well','also','back','even','still','way','take','every','any','both','each','few','more','most','other','some','such','no','nor','not','only','own','same','so','than','too','very','s','t','can','will','just','don','should','now'}
 
@@ -349,5 +361,34 @@ def refresh_data():
     
     return redirect(url_for('index'))
 
+# Historical analytics (served from the daily rollups in the archive)
+MAX_ANALYTICS_DAYS = 3650
+MAX_ANALYTICS_LIMIT = 1000
+
+def _days_arg():
+    days = request.args.get('days', 90, type=int)
+    return max(1, min(days, MAX_ANALYTICS_DAYS))
+
+@app.route('/api/analytics/postings-per-day')
+def analytics_postings_per_day():
+    return jsonify(job_archive.postings_per_day(days=_days_arg()))
+
+@app.route('/api/analytics/median-stipend')
+def analytics_median_stipend():
+    # The rollup is keyed by tokenize_title output, so the keyword must reduce to one token
+    tokens = tokenize_title(request.args.get('keyword', ''))
+    if len(tokens) != 1:
+        return jsonify({'error': 'keyword must be a single word of 3+ letters that is not a stopword'}), 400
+    keyword = tokens[0]
+    return jsonify({'keyword': keyword,
+                    'currencies': job_archive.median_stipend(keyword, days=_days_arg())})
+
+@app.route('/api/analytics/time-to-close')
+def analytics_time_to_close():
+    company = request.args.get('company') or None
+    limit = request.args.get('limit', 100, type=int)
+    limit = max(1, min(limit, MAX_ANALYTICS_LIMIT))
+    return jsonify(job_archive.time_to_close(days=_days_arg(), company=company, limit=limit))
+
 if __name__ == "__main__":
     app.run(debug=True)
@@ -16,6 +16,9 @@ HEADERS = {
 
 BASE = 'https://internshala.com'
 
+# Sources whose jobs are hard-coded samples rather than scraped listings
+SIMULATED_SOURCES = {'Indeed', 'LinkedIn'}
+
 def fetch(url, retries=3, backoff=1.5, timeout=15):
     """Fetch URL with retries and exponential backoff."""
     last_err = None
@@ -0,0 +1,276 @@
+import sqlite3
+import re
+import os
+import logging
+from contextlib import closing
+from datetime import datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ARCHIVE_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'job_archive.db')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    scraped_at TEXT NOT NULL,
+    total_jobs INTEGER NOT NULL,
+    sources TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_snapshots_scraped_at ON snapshots(scraped_at);
+
+-- One row per listing with its latest attributes, when it was first/last seen and when it closed
+CREATE TABLE IF NOT EXISTS listings (
+    id INTEGER PRIMARY KEY,
+    link TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    company TEXT NOT NULL,
+    location TEXT NOT NULL,
+    source TEXT,
+    duration TEXT,
+    stipend_range TEXT,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    missed INTEGER NOT NULL DEFAULT 0,
+    closed_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_listings_closed_at ON listings(closed_at);
+CREATE INDEX IF NOT EXISTS idx_listings_company ON listings(company);
+CREATE INDEX IF NOT EXISTS idx_listings_location ON listings(location);
+
+-- Snapshot membership only: attributes live on listings
+CREATE TABLE IF NOT EXISTS snapshot_jobs (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots(id),
+    listing_id INTEGER NOT NULL REFERENCES listings(id),
+    PRIMARY KEY (snapshot_id, listing_id)
+) WITHOUT ROWID;
+
+-- Daily rollups, updated incrementally on every snapshot
+CREATE TABLE IF NOT EXISTS daily_postings (
+    day TEXT PRIMARY KEY,
+    postings INTEGER NOT NULL DEFAULT 0,
+    new_postings INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS daily_keyword_stipend (
+    day TEXT NOT NULL,
+    keyword TEXT NOT NULL,
+    currency TEXT NOT NULL,
+    stipend INTEGER NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, keyword, currency, stipend)
+);
+CREATE INDEX IF NOT EXISTS idx_daily_keyword_stipend_keyword ON daily_keyword_stipend(keyword, day);
+"""
+
+CURRENCIES = {'₹': 'INR', '$': 'USD'}
+
+# Consecutive snapshots of its source a listing must be missing from to count as closed
+MISSED_SNAPSHOTS_TO_CLOSE = 2
+
+
+# Database paths whose schema has already been created by this process
+_initialised = set()
+
+
+def _connect(db_path=None):
+    # Resolved per call so ARCHIVE_DB from .env (loaded after import) is honoured
+    db_path = db_path or os.environ.get('ARCHIVE_DB', DEFAULT_ARCHIVE_DB)
+    conn = sqlite3.connect(db_path)
+    if db_path not in _initialised:
+        conn.executescript(SCHEMA)
+        _initialised.add(db_path)
+    return conn
+
+
+# Multiplier converting an amount for each pay period into a monthly amount
+PERIODS = {'month': 1, 'week': 52 / 12}
+
+
+def parse_stipend(stipend_range):
+    """Parse a stipend string into (currency, monthly midpoint) or None.
+
+    Lump-sum stipends and strings without a recognised pay period are skipped.
+    """
+    if not stipend_range:
+        return None
+    text = stipend_range.lower()
+    if 'lump' in text:
+        return None
+    currency = next((code for sym, code in CURRENCIES.items() if sym in text), None)
+    period = next((mult for name, mult in PERIODS.items() if name in text), None)
+    amounts = [int(n.replace(',', '')) for n in re.findall(r'\d[\d,]*', text)]
+    if not currency or not period or not amounts:
+        return None
+    return currency, round(sum(amounts) / len(amounts) * period)
+
+
+def _median_from_counts(buckets):
+    """Median of a sorted list of (value, count) pairs, rounded to an integer."""
+    total = sum(count for _, count in buckets)
+    if total == 0:
+        return None
+    lower, upper = (total - 1) // 2, total // 2
+    seen = 0
+    low_value = None
+    for value, count in buckets:
+        if low_value is None and seen + count > lower:
+            low_value = value
+        if seen + count > upper:
+            return round((low_value + value) / 2)
+        seen += count
+    return None
+
+
+def archive_snapshot(jobs, tokenize, db_path=None, now=None):
+    """Store a scraped job set and update the daily rollups.
+
+    A listing is counted at most once per day in the postings rollup, however
+    many snapshots are taken that day, and only once (on the day it is first
+    seen) in the stipend rollup.
+
+    A listing is closed once it is missing from MISSED_SNAPSHOTS_TO_CLOSE
+    consecutive snapshots that include its source, so a single failed page
+    fetch does not close it. Its closed_at is set to its last_seen time, and
+    it is reopened if it reappears later.
+    """
+    now = now or datetime.now()
+    scraped_at = now.isoformat()
+    day = now.date().isoformat()
+    sources = sorted(set(job.get('source', '') for job in jobs))
+
+    with closing(_connect(db_path)) as conn, conn:
+        cur = conn.execute(
+            "INSERT INTO snapshots (scraped_at, total_jobs, sources) VALUES (?, ?, ?)",
+            (scraped_at, len(jobs), ','.join(sources))
+        )
+        snapshot_id = cur.lastrowid
+
+        postings = new_postings = 0
+        stipend_counts = {}
+        seen_links = set()
+        listing_ids = []
+        for job in jobs:
+            if job['link'] in seen_links:
+                continue
+            seen_links.add(job['link'])
+
+            row = conn.execute(
+                "SELECT id, last_seen FROM listings WHERE link = ?", (job['link'],)
+            ).fetchone()
+            if row is None:
+                new_postings += 1
+                cur = conn.execute(
+                    "INSERT INTO listings (link, title, company, location, source, duration, "
+                    "stipend_range, first_seen, last_seen) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (job['link'], job['title'], job['company'], job['location'], job.get('source'),
+                     job.get('duration'), job.get('stipend_range'), scraped_at, scraped_at)
+                )
+                listing_ids.append(cur.lastrowid)
+                # Stipends are counted once per posting, on the day it first appears
+                stipend = parse_stipend(job.get('stipend_range'))
+                if stipend:
+                    currency, amount = stipend
+                    for keyword in set(tokenize(job['title'])):
+                        key = (keyword, currency, amount)
+                        stipend_counts[key] = stipend_counts.get(key, 0) + 1
+            else:
+                listing_id, last_seen = row
+                listing_ids.append(listing_id)
+                conn.execute(
+                    "UPDATE listings SET duration = ?, stipend_range = ?, last_seen = ?, missed = 0, "
+                    "closed_at = NULL WHERE id = ?",
+                    (job.get('duration'), job.get('stipend_range'), scraped_at, listing_id)
+                )
+                if last_seen[:10] == day:
+                    continue  # Already counted in today's rollup
+
+            postings += 1
+
+        conn.executemany(
+            "INSERT INTO snapshot_jobs (snapshot_id, listing_id) VALUES (?, ?)",
+            [(snapshot_id, listing_id) for listing_id in listing_ids]
+        )
+        conn.execute(
+            "INSERT INTO daily_postings (day, postings, new_postings) VALUES (?, ?, ?) "
+            "ON CONFLICT(day) DO UPDATE SET postings = postings + excluded.postings, "
+            "new_postings = new_postings + excluded.new_postings",
+            (day, postings, new_postings)
+        )
+        conn.executemany(
+            "INSERT INTO daily_keyword_stipend (day, keyword, currency, stipend, count) "
+            "VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(day, keyword, currency, stipend) DO UPDATE SET count = count + excluded.count",
+            [(day, keyword, currency, amount, count)
+             for (keyword, currency, amount), count in stipend_counts.items()]
+        )
+
+        if sources:
+            conn.execute(
+                f"UPDATE listings SET missed = missed + 1 WHERE closed_at IS NULL AND last_seen < ? "
+                f"AND source IN ({','.join('?' * len(sources))})",
+                (scraped_at, *sources)
+            )
+            conn.execute(
+                "UPDATE listings SET closed_at = last_seen WHERE closed_at IS NULL AND missed >= ?",
+                (MISSED_SNAPSHOTS_TO_CLOSE,)
+            )
+
+    logger.info(f"Archived snapshot {snapshot_id} with {len(jobs)} jobs")
+    return snapshot_id
+
+
+def _since(days):
+    """First day of a window of `days` days ending today (inclusive)."""
+    return (datetime.now().date() - timedelta(days=days - 1)).isoformat()
+
+
+def postings_per_day(days=90, db_path=None):
+    """Distinct postings seen per day, from the daily rollup."""
+    with closing(_connect(db_path)) as conn:
+        rows = conn.execute(
+            "SELECT day, postings, new_postings FROM daily_postings WHERE day >= ? ORDER BY day",
+            (_since(days),)
+        ).fetchall()
+    return [{'day': d, 'postings': p, 'new_postings': n} for d, p, n in rows]
+
+
+def median_stipend(keyword, days=90, db_path=None):
+    """Median monthly stipend per currency over postings first seen in the window."""
+    with closing(_connect(db_path)) as conn:
+        rows = conn.execute(
+            "SELECT currency, stipend, SUM(count) FROM daily_keyword_stipend "
+            "WHERE keyword = ? AND day >= ? GROUP BY currency, stipend ORDER BY currency, stipend",
+            (keyword.lower(), _since(days))
+        ).fetchall()
+
+    buckets = {}
+    for currency, stipend, count in rows:
+        buckets.setdefault(currency, []).append((stipend, count))
+    return {
+        currency: {
+            'median': _median_from_counts(values),
+            'postings': sum(count for _, count in values)
+        }
+        for currency, values in buckets.items()
+    }
+
+
+def time_to_close(days=90, company=None, limit=100, db_path=None):
+    """Days each listing stayed open, for listings closed within the window."""
+    query = ("SELECT link, title, company, first_seen, closed_at, "
+             "julianday(closed_at) - julianday(first_seen) FROM listings "
+             "WHERE closed_at IS NOT NULL AND closed_at >= ?")
+    params = [_since(days)]
+    if company:
+        query += " AND company = ?"
+        params.append(company)
+    query += " ORDER BY closed_at DESC LIMIT ?"
+    params.append(limit)
+
+    with closing(_connect(db_path)) as conn:
+        rows = conn.execute(query, params).fetchall()
+    return [
+        {'link': link, 'title': title, 'company': comp, 'first_seen': first_seen,
+         'closed_at': closed_at, 'days_open': round(days_open, 2)}
+        for link, title, comp, first_seen, closed_at, days_open in rows
+    ]
@@ -0,0 +1,125 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+import app as app_module
+import job_archive
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    path = str(tmp_path / 'archive.db')
+    monkeypatch.setenv('ARCHIVE_DB', path)
+    return path
+
+
+def job(link, source):
+    return {
+        'title': 'Python Intern',
+        'company': 'Company',
+        'location': 'Remote',
+        'link': link,
+        'duration': '3 months',
+        'stipend_range': '$2000-$4000/month',
+        'source': source,
+    }
+
+
+def test_archive_jobs_skips_simulated_sources(db):
+    app_module.archive_jobs([job('a', 'Internshala'), job('b', 'Indeed'), job('c', 'LinkedIn')])
+
+    rows = job_archive.postings_per_day(days=1)
+    assert [r['postings'] for r in rows] == [1]
+
+
+def test_archive_jobs_with_only_simulated_sources_archives_nothing(db):
+    app_module.archive_jobs([job('b', 'Indeed'), job('c', 'LinkedIn')])
+
+    assert job_archive.postings_per_day(days=1) == []
+
+
+@pytest.fixture
+def client(db):
+    app_module.app.config['TESTING'] = True
+    return app_module.app.test_client()
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Record the keyword arguments each analytics function is called with."""
+    recorded = {}
+
+    def recorder(name):
+        def fake(*args, **kwargs):
+            recorded[name] = kwargs
+            return []
+        return fake
+
+    for name in ('postings_per_day', 'median_stipend', 'time_to_close'):
+        monkeypatch.setattr(job_archive, name, recorder(name))
+    return recorded
+
+
+@pytest.mark.parametrize('days, expected', [
+    ('30', 30),
+    ('0', 1),
+    ('-5', 1),
+    ('800000', app_module.MAX_ANALYTICS_DAYS),
+    ('abc', 90),
+    (None, 90),
+])
+def test_days_clamped(client, calls, days, expected):
+    query = {} if days is None else {'days': days}
+    for path, name in [('/api/analytics/postings-per-day', 'postings_per_day'),
+                       ('/api/analytics/time-to-close', 'time_to_close')]:
+        assert client.get(path, query_string=query).status_code == 200
+        assert calls[name]['days'] == expected
+
+    query['keyword'] = 'python'
+    assert client.get('/api/analytics/median-stipend', query_string=query).status_code == 200
+    assert calls['median_stipend']['days'] == expected
+
+
+@pytest.mark.parametrize('limit, expected', [
+    ('10', 10),
+    ('-1', 1),
+    ('0', 1),
+    ('5000', app_module.MAX_ANALYTICS_LIMIT),
+    ('abc', 100),
+])
+def test_limit_clamped(client, calls, limit, expected):
+    response = client.get('/api/analytics/time-to-close', query_string={'limit': limit})
+    assert response.status_code == 200
+    assert calls['time_to_close']['limit'] == expected
+
+
+@pytest.mark.parametrize('keyword', ['', 'the', 'ai', 'ml', 'machine learning'])
+def test_median_stipend_rejects_unindexed_keyword(client, keyword):
+    response = client.get('/api/analytics/median-stipend', query_string={'keyword': keyword})
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+
+def test_median_stipend_normalises_keyword(client, calls):
+    response = client.get('/api/analytics/median-stipend', query_string={'keyword': ' Python '})
+    assert response.status_code == 200
+    assert response.get_json() == {'keyword': 'python', 'currencies': []}
+
+
+def test_analytics_json_shape(client, db):
+    now = datetime.now()
+    for n, links in [(3, 'ab'), (2, 'ab'), (1, 'a'), (0, 'a')]:
+        job_archive.archive_snapshot([job(link, 'Internshala') for link in links],
+                                     app_module.tokenize_title, now=now - timedelta(days=n))
+
+    postings = client.get('/api/analytics/postings-per-day').get_json()
+    assert len(postings) == 4
+    assert set(postings[0]) == {'day', 'postings', 'new_postings'}
+
+    median = client.get('/api/analytics/median-stipend?keyword=python').get_json()
+    assert median == {'keyword': 'python', 'currencies': {'USD': {'median': 3000, 'postings': 2}}}
+
+    closed = client.get('/api/analytics/time-to-close').get_json()
+    assert [c['link'] for c in closed] == ['b']
+    assert set(closed[0]) == {'link', 'title', 'company', 'first_seen', 'closed_at', 'days_open'}
+    assert closed[0]['days_open'] == 1
@@ -0,0 +1,158 @@
+import re
+import sqlite3
+from contextlib import closing
+from datetime import datetime, timedelta
+
+import pytest
+
+import job_archive
+
+
+def tokenize(title):
+    return [w for w in re.findall(r'[a-z]+', title.lower()) if len(w) > 2]
+
+
+def job(link, title='Python Intern', stipend='₹10,000 per month', source='Internshala'):
+    return {
+        'title': title,
+        'company': f'Company {link}',
+        'location': 'Remote',
+        'link': link,
+        'duration': '3 months',
+        'stipend_range': stipend,
+        'source': source,
+    }
+
+
+@pytest.fixture
+def db(tmp_path):
+    return str(tmp_path / 'archive.db')
+
+
+def days_ago(n, hour=12):
+    today = datetime.now().replace(hour=hour, minute=0, second=0, microsecond=0)
+    return today - timedelta(days=n)
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('₹15,000 - ₹25,000 per month', ('INR', 20000)),
+    ('$2000-$4000/month', ('USD', 3000)),
+    ('₹ 1,200 /week', ('INR', 5200)),
+    ('₹ 2,00,000 lump sum', None),
+    ('₹ 5000', None),
+    ('Unpaid', None),
+    ('', None),
+])
+def test_parse_stipend(text, expected):
+    assert job_archive.parse_stipend(text) == expected
+
+
+@pytest.mark.parametrize('buckets, expected', [
+    ([], None),
+    ([(10, 1)], 10),
+    ([(10, 1), (20, 1)], 15),
+    ([(10, 2), (20, 1)], 10),
+    ([(10, 1), (20, 2), (30, 1)], 20),
+    ([(10, 1), (30, 1), (40, 2)], 35),
+    ([(10, 1), (13, 1)], 12),
+])
+def test_median_from_counts(buckets, expected):
+    median = job_archive._median_from_counts(buckets)
+    assert median == expected
+    assert median is None or isinstance(median, int)
+
+
+def test_postings_deduplicated_within_a_day(db):
+    jobs = [job('a'), job('b')]
+    job_archive.archive_snapshot(jobs, tokenize, db_path=db, now=days_ago(1, hour=9))
+    job_archive.archive_snapshot(jobs, tokenize, db_path=db, now=days_ago(1, hour=15))
+    job_archive.archive_snapshot(jobs + [job('c')], tokenize, db_path=db, now=days_ago(0))
+
+    rows = job_archive.postings_per_day(days=7, db_path=db)
+    assert [(r['postings'], r['new_postings']) for r in rows] == [(2, 2), (3, 1)]
+
+
+def test_median_stipend_counts_each_posting_once(db):
+    long_lived = job('a', stipend='₹10,000 per month')
+    short_lived = job('b', stipend='₹30,000 per month')
+    job_archive.archive_snapshot([long_lived, short_lived], tokenize, db_path=db, now=days_ago(5))
+    for n in range(4, -1, -1):
+        job_archive.archive_snapshot([long_lived], tokenize, db_path=db, now=days_ago(n))
+
+    result = job_archive.median_stipend('python', days=30, db_path=db)
+    assert result == {'INR': {'median': 20000, 'postings': 2}}
+    assert job_archive.median_stipend('django', days=30, db_path=db) == {}
+
+
+def test_single_miss_does_not_close_listing(db):
+    job_archive.archive_snapshot([job('a'), job('b')], tokenize, db_path=db, now=days_ago(3))
+    job_archive.archive_snapshot([job('a')], tokenize, db_path=db, now=days_ago(2))
+    job_archive.archive_snapshot([job('a'), job('b')], tokenize, db_path=db, now=days_ago(1))
+
+    assert job_archive.time_to_close(days=30, db_path=db) == []
+
+
+def test_listing_closes_at_last_seen_and_reopens(db):
+    job_archive.archive_snapshot([job('a'), job('b')], tokenize, db_path=db, now=days_ago(4))
+    job_archive.archive_snapshot([job('a'), job('b')], tokenize, db_path=db, now=days_ago(3))
+    job_archive.archive_snapshot([job('a')], tokenize, db_path=db, now=days_ago(2))
+    job_archive.archive_snapshot([job('a')], tokenize, db_path=db, now=days_ago(1))
+
+    closed = job_archive.time_to_close(days=30, db_path=db)
+    assert [c['link'] for c in closed] == ['b']
+    assert closed[0]['days_open'] == 1
+    assert closed[0]['closed_at'] == days_ago(3).isoformat()
+
+    job_archive.archive_snapshot([job('a'), job('b')], tokenize, db_path=db, now=days_ago(0))
+    assert job_archive.time_to_close(days=30, db_path=db) == []
+
+
+def test_listings_from_absent_source_stay_open(db):
+    snapshot = [job('a'), job('x', source='LinkedIn')]
+    job_archive.archive_snapshot(snapshot, tokenize, db_path=db, now=days_ago(3))
+    job_archive.archive_snapshot([job('x', source='LinkedIn')], tokenize, db_path=db, now=days_ago(2))
+    job_archive.archive_snapshot([job('x', source='LinkedIn')], tokenize, db_path=db, now=days_ago(1))
+
+    assert job_archive.time_to_close(days=30, db_path=db) == []
+
+
+def test_archive_path_read_at_call_time(tmp_path, monkeypatch):
+    path = tmp_path / 'from_env.db'
+    monkeypatch.setenv('ARCHIVE_DB', str(path))
+    job_archive.archive_snapshot([job('a')], tokenize)
+    assert path.exists()
+
+
+def test_window_covers_exactly_days_including_today(db):
+    for n in range(3):
+        job_archive.archive_snapshot([job(f'l{n}')], tokenize, db_path=db, now=days_ago(n))
+
+    assert len(job_archive.postings_per_day(days=1, db_path=db)) == 1
+    assert len(job_archive.postings_per_day(days=2, db_path=db)) == 2
+    assert job_archive.median_stipend('python', days=1, db_path=db)['INR']['postings'] == 1
+
+
+def test_schema_created_once_per_path(db, monkeypatch):
+    job_archive.postings_per_day(db_path=db)
+
+    # Re-running the schema would now raise sqlite3.OperationalError
+    monkeypatch.setattr(job_archive, 'SCHEMA', 'not valid sql')
+    assert job_archive.postings_per_day(db_path=db) == []
+
+
+def test_snapshots_store_membership_and_latest_attributes(db):
+    job_archive.archive_snapshot([job('a'), job('b')], tokenize, db_path=db, now=days_ago(1))
+    job_archive.archive_snapshot([job('a', stipend='₹12,000 per month')], tokenize,
+                                 db_path=db, now=days_ago(0))
+
+    with closing(sqlite3.connect(db)) as conn:
+        members = conn.execute(
+            "SELECT s.id, l.link FROM snapshot_jobs sj JOIN snapshots s ON s.id = sj.snapshot_id "
+            "JOIN listings l ON l.id = sj.listing_id ORDER BY s.id, l.link"
+        ).fetchall()
+        stipend = conn.execute(
+            "SELECT stipend_range FROM listings WHERE link = 'a'"
+        ).fetchone()[0]
+
+    assert members == [(1, 'a'), (1, 'b'), (2, 'a')]
+    assert stipend == '₹12,000 per month'